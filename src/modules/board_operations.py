@@ -6,27 +6,40 @@ It supports operations such as fetching and setting board background images, man
 creating and deleting labels on boards, creating boards based on names, and more.
 
 Functions:
-    - fetch_image(): Downloads the background image from a specified URL.
+    - fetch_image(): Downloads the background image from a specified URL to a temporary file.
     - set_board_background_image(board_id): Sets a custom background image for a specified Trello board.
-    - manage_board_lists(board_id): Manages the default and required lists on a Trello board.
-    - create_missing_labels(board_id): Creates any missing labels on a specified Trello board based on predefined defaults.
+    - manage_board_lists(board_id): Manages the default and required lists on a Trello board, creating
+      any missing required lists concurrently.
+    - create_missing_labels(board_id): Creates any missing labels on a specified Trello board based on predefined defaults,
+      issuing the label requests concurrently.
+    - create_label(_config, _settings, board_id, label, color): Creates a single label on a board.
+    - get_lists(_config, _settings, board_id): Fetches the lists on a board, served from a short-lived cache.
+    - get_labels(_config, _settings, board_id): Fetches the labels on a board, served from a short-lived cache.
+    - invalidate_lists(board_id): Drops the cached lists for a board after it has been modified.
+    - invalidate_labels(board_id): Drops the cached labels for a board after it has been modified.
     - fetch_all_list_ids(_config, _settings, board_id): Retrieves all list IDs for a given board.
     - fetch_all_label_ids(_config, _settings, board_id): Retrieves all label IDs for a given board.
+    - fetch_board_metadata(_config, _settings, board_id): Retrieves list IDs and label IDs together, with a
+      single board request (priming both caches) when either is not already cached.
     - create_board(_config, _settings, board_name): Creates a new Trello board, deletes default lists and labels, and returns its ID.
     - get_board_id(_config, _settings, board_name): Gets the board ID given a board name or creates it if it doesn't exist.
-    - delete_list(_config, _settings, board_id, list_name): Deletes a list on a board.
+    - load_cached_board_id(_config, _settings, board_name): Returns the board ID saved by an earlier run if that board is still open
+      under the same name.
+    - save_board_id(_config, board_name, board_id): Saves a resolved board ID for later runs.
+    - delete_list(_config, _settings, board_id, list_id): Deletes (closes) a list on a board by its ID.
     - check_list_exists(_config, _settings, board_id, list_name): Checks if a list exists on a board.
-    - create_list(_config, _settings, board_id, list_name): Creates a new list on a board.
+    - create_list(_config, _settings, board_id, list_name, pos=None): Creates a new list on a board.
     - upload_custom_board_background(_config, _settings, member_id, image_filepath): Uploads a custom background image for the board.
     - set_custom_board_background(_config, _settings, board_id, background_id): Sets a custom background for the board.
     - get_member_id(_config, _settings): Retrieves the member ID.
     - get_labels_on_board(_config, _settings, board_id): Fetches all labels on a board.
     - delete_label(_config, _settings, label_id): Deletes a specific label.
-    - delete_all_labels(_config, _settings, board_id): Deletes all labels on a board.
+    - delete_all_labels(_config, _settings, board_id): Deletes all labels on a board concurrently.
 
 Dependencies:
     - os: Provides a way of using operating system-dependent functionality.
     - logging: Used for logging information and error messages.
+    - json / hashlib: Used to persist resolved board IDs between runs.
     - .trello_api: Houses Trello-specific API functions.
     - ._config_loader: Provides functions to load configurations and settings.
 
@@ -34,18 +47,24 @@ Globals:
     - _settings: Global variable storing loaded settings from an INI file.
     - _config: Global variable storing loaded configurations.
     - TRELLO_ENTITY: Dictionary containing constants for different Trello entities.
+    - _LISTS_CACHE / _LABELS_CACHE: Snapshots of board lists and labels, keyed by board ID.
+    - METADATA_CACHE_TTL: Seconds a cached list or label snapshot stays valid.
+    - _BOARD_ID_CACHE: Board IDs resolved during this run, keyed by token and board name.
+    - BOARD_ID_CACHE_PATH: File that remembers resolved board IDs across runs.
 
 Author: Alex McGonigle @grannyprogramming
 """
 
 import os
+import json
+import time
+import hashlib
 import logging
-from .trello_api import download_image, trello_request
+from .trello_api import download_image, trello_request, run_concurrently
 from .config_loader import load_ini_settings, load_config
 
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
-)
+# Handlers and format are configured by the entry point (main.py).
+logger = logging.getLogger(__name__)
 
 _settings = load_ini_settings()
 _config = load_config()
@@ -53,6 +72,24 @@ _config = load_config()
 # Constants
 TRELLO_ENTITY = {"BOARD": "boards", "MEMBER": "members", "LIST": "lists"}
 
+# Gap between explicit list positions, matching the spacing Trello uses itself.
+LIST_POSITION_STEP = 65536
+
+# Lists and labels are read far more often than they change, so keep one
+# snapshot per board and drop it whenever this module mutates that resource.
+# Entries also expire, so edits made outside this process are picked up.
+METADATA_CACHE_TTL = 300
+_LISTS_CACHE = {}
+_LABELS_CACHE = {}
+
+# setup and the retest pass both resolve the same board, so remember the answer.
+_BOARD_ID_CACHE = {}
+
+# Board IDs resolved by earlier runs, so a run can skip the full me/boards scan.
+BOARD_ID_CACHE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "trello-scheduler", "board_ids.json"
+)
+
 
 def fetch_image():
     """Fetches the background image from a given URL."""
@@ -69,9 +106,12 @@ def set_board_background_image(board_id):
     if not image_filepath:
         raise ValueError("Failed to download image")
 
-    background_id = upload_custom_board_background(
-        _config, _settings, member_id, image_filepath
-    )
+    try:
+        background_id = upload_custom_board_background(
+            _config, _settings, member_id, image_filepath
+        )
+    finally:
+        os.remove(image_filepath)
     if not background_id:
         raise ValueError("Failed to upload custom board background image")
 
@@ -81,59 +121,171 @@ def set_board_background_image(board_id):
 
 def manage_board_lists(board_id):
     """Manages the required lists for a given board."""
-
-    for required_list in _settings["REQUIRED_LISTS"]:
-        if not check_list_exists(_config, _settings, board_id, required_list):
-            create_list(_config, _settings, board_id, required_list)
+    lists = get_lists(_config, _settings, board_id)
+    if lists is None:
+        raise ValueError(f"Failed to fetch lists for board with ID: {board_id}")
+
+    existing_list_names = {lst["name"] for lst in lists}
+    missing_lists = [
+        required_list
+        for required_list in _settings["REQUIRED_LISTS"]
+        if required_list not in existing_list_names
+    ]
+
+    # The lists are created concurrently, so place each one explicitly after the
+    # existing lists to keep the REQUIRED_LISTS order on the board.
+    last_position = max((lst["pos"] for lst in lists), default=0)
+    new_lists = [
+        (list_name, last_position + (index + 1) * LIST_POSITION_STEP)
+        for index, list_name in enumerate(missing_lists)
+    ]
+    run_concurrently(
+        lambda new_list: create_list(_config, _settings, board_id, *new_list),
+        new_lists,
+    )
 
 
 def create_missing_labels(board_id):
     """Creates missing labels for a given board."""
-    labels = trello_request(_config, _settings, f"{board_id}/labels", entity="boards")
+    labels = get_labels(_config, _settings, board_id)
     if labels is None:
         raise ValueError(f"Failed to fetch labels for board with ID: {board_id}")
 
-    label_names = [l.get("name") for l in labels if "name" in l]
-    for label, color in _settings["DEFAULT_LABELS_COLORS"].items():
-        if label not in label_names:
-            trello_request(
-                _config,
-                _settings,
-                "labels",
-                "POST",
-                entity="boards",
-                board_id=board_id,
-                name=label,
-                color=color,
-            )
-            logging.info(
-                "Created label %s with color %s for board ID: %s",
-                label,
-                color,
-                board_id,
-            )
+    existing_label_names = {l.get("name") for l in labels if "name" in l}
+    missing_labels = [
+        (label, color)
+        for label, color in _settings["DEFAULT_LABELS_COLORS"].items()
+        if label not in existing_label_names
+    ]
+    # Labels are independent of each other, so create them concurrently; the
+    # request rate stays within Trello's limit via make_request's rate limiter.
+    run_concurrently(
+        lambda missing_label: create_label(
+            _config, _settings, board_id, *missing_label
+        ),
+        missing_labels,
+    )
+
+
+def create_label(_config, _settings, board_id, label, color):
+    """Create a label with the given color on a board."""
+    response = trello_request(
+        _config,
+        _settings,
+        "labels",
+        "POST",
+        entity="boards",
+        board_id=board_id,
+        name=label,
+        color=color,
+    )
+    logger.info(
+        "Created label %s with color %s for board ID: %s",
+        label,
+        color,
+        board_id,
+    )
+    invalidate_labels(board_id)
+    return response
+
+
+def _is_fresh(cache, board_id):
+    """Check whether a board has a cache entry that has not yet expired."""
+    entry = cache.get(board_id)
+    return bool(entry) and time.monotonic() - entry[0] < METADATA_CACHE_TTL
+
+
+def _cached_fetch(cache, board_id, fetch):
+    """Return the cached response for a board, calling fetch when missing or expired."""
+    if _is_fresh(cache, board_id):
+        return cache[board_id][1]
+    response = fetch()
+    if response is None:
+        return None
+    cache[board_id] = (time.monotonic(), response)
+    return response
+
+
+def get_lists(_config, _settings, board_id):
+    """Fetch the lists on a board, reusing the cached response when available."""
+    return _cached_fetch(
+        _LISTS_CACHE,
+        board_id,
+        lambda: trello_request(
+            _config, _settings, f"{board_id}/lists", fields="id,name,pos"
+        ),
+    )
+
+
+def get_labels(_config, _settings, board_id):
+    """Fetch the labels on a board, reusing the cached response when available."""
+    return _cached_fetch(
+        _LABELS_CACHE,
+        board_id,
+        lambda: trello_request(
+            _config, _settings, f"{board_id}/labels", fields="id,name"
+        ),
+    )
+
+
+def invalidate_lists(board_id):
+    """Drop the cached lists for a board so the next read refetches them."""
+    _LISTS_CACHE.pop(board_id, None)
+
+
+def invalidate_labels(board_id):
+    """Drop the cached labels for a board so the next read refetches them."""
+    _LABELS_CACHE.pop(board_id, None)
+
+
+def _ids_by_name(items):
+    """Index Trello lists or labels by name, mapping each name to its ID."""
+    return {item["name"]: item["id"] for item in items}
 
 
 def fetch_all_list_ids(_config, _settings, board_id):
     """Retrieve all list IDs for a given board."""
-    response = trello_request(_config, _settings, f"{board_id}/lists")
+    response = get_lists(_config, _settings, board_id)
     if response is None:
-        logging.error("Failed to fetch lists for board with ID: %s", board_id)
+        logger.error("Failed to fetch lists for board with ID: %s", board_id)
         return {}
-    list_ids = {l["name"]: l["id"] for l in response}
-    logging.debug("Fetched list IDs: %s", list_ids)
+    list_ids = _ids_by_name(response)
+    logger.debug("Fetched list IDs: %s", list_ids)
     return list_ids
 
 
 def fetch_all_label_ids(_config, _settings, board_id):
     """Retrieve all label IDs for a given board."""
-    response = trello_request(
-        _config, _settings, "labels", entity="boards", board_id=board_id
-    )
+    response = get_labels(_config, _settings, board_id)
     if response is None:
-        logging.error("Failed to fetch labels for board with ID: %s", board_id)
+        logger.error("Failed to fetch labels for board with ID: %s", board_id)
         return {}
-    return {l["name"]: l["id"] for l in response}
+    return _ids_by_name(response)
+
+
+def fetch_board_metadata(_config, _settings, board_id):
+    """Retrieve the list IDs and label IDs for a given board."""
+    if not (_is_fresh(_LISTS_CACHE, board_id) and _is_fresh(_LABELS_CACHE, board_id)):
+        # The board endpoint can nest both collections, saving a round-trip
+        board = trello_request(
+            _config,
+            _settings,
+            "",
+            board_id=board_id,
+            fields="id",
+            lists="open",
+            list_fields="id,name,pos",
+            labels="all",
+            label_fields="id,name",
+        )
+        if board is not None:
+            fetched_at = time.monotonic()
+            _LISTS_CACHE[board_id] = (fetched_at, board["lists"])
+            _LABELS_CACHE[board_id] = (fetched_at, board["labels"])
+    return (
+        fetch_all_list_ids(_config, _settings, board_id),
+        fetch_all_label_ids(_config, _settings, board_id),
+    )
 
 
 def create_board(_config, _settings, board_name):
@@ -143,57 +295,117 @@ def create_board(_config, _settings, board_name):
     )
 
     # Log the response for debugging
-    logging.info("Response from board creation: %s", new_board)
+    logger.info("Response from board creation: %s", new_board)
 
     if new_board and "id" in new_board:
-        logging.info("Successfully created board with ID: %s", new_board["id"])
+        logger.info("Successfully created board with ID: %s", new_board["id"])
 
-        # Delete default lists for the newly created board
+        # Delete default lists for the newly created board, resolving their IDs
+        # from a single fetch of the board's lists
+        lists = get_lists(_config, _settings, new_board["id"]) or []
+        list_ids = _ids_by_name(lists)
         for default_list in _settings["DEFAULT_LISTS"]:
-            if check_list_exists(_config, _settings, new_board["id"], default_list):
-                delete_list(_config, _settings, new_board["id"], default_list)
+            if default_list in list_ids:
+                delete_list(_config, _settings, new_board["id"], list_ids[default_list])
 
         # Delete all labels for the newly created board
         delete_all_labels(_config, _settings, new_board["id"])
 
         return new_board["id"]
     else:
-        logging.error("Failed to create board with name: %s", board_name)
+        logger.error("Failed to create board with name: %s", board_name)
         return None
 
 
 def get_board_id(_config, _settings, board_name):
     """Get the board ID given a board name. If the board does not exist or is closed, create it."""
-    boards = trello_request(_config, _settings, resource="me/boards", entity="members")
-
-    # Check if an open board with the given name exists
-    board_id = next(
-        (
-            board["id"]
-            for board in boards
-            if board["name"] == board_name and not board["closed"]
-        ),
-        None,
+    cache_key = _board_id_cache_key(_config, board_name)
+    if cache_key in _BOARD_ID_CACHE:
+        return _BOARD_ID_CACHE[cache_key]
+
+    board_id = load_cached_board_id(_config, _settings, board_name)
+    if board_id:
+        logger.info("Using cached board ID: %s", board_id)
+        _BOARD_ID_CACHE[cache_key] = board_id
+        return board_id
+
+    boards = trello_request(
+        _config,
+        _settings,
+        resource="me/boards",
+        entity="members",
+        fields="id,name,closed",
     )
 
+    # Index the open boards by name, keeping the first board for each name
+    open_board_ids = {}
+    for board in boards:
+        if not board["closed"]:
+            open_board_ids.setdefault(board["name"], board["id"])
+    board_id = open_board_ids.get(board_name)
+
     # If board doesn't exist or is closed, create it
     if not board_id:
         board_id = create_board(_config, _settings, board_name)
-        logging.info("Created a new board with ID: %s", board_id)
+        logger.info("Created a new board with ID: %s", board_id)
     else:
-        logging.info("Using existing board with ID: %s", board_id)
+        logger.info("Using existing board with ID: %s", board_id)
 
     if not board_id:
-        logging.error("Failed to find or create a board with name: %s", board_name)
+        logger.error("Failed to find or create a board with name: %s", board_name)
+    else:
+        _BOARD_ID_CACHE[cache_key] = board_id
+        save_board_id(_config, board_name, board_id)
 
     return board_id
 
 
-def delete_list(_config, _settings, board_id, list_name):
-    """Delete a list on the board."""
-    lists = trello_request(_config, _settings, f"{board_id}/lists")
-    list_id = next(lst["id"] for lst in lists if lst["name"] == list_name)
-    return trello_request(
+def _board_id_cache_key(_config, board_name):
+    """Key cached board IDs by board name and a hash of the token that owns them."""
+    token = _config["OAUTH_TOKEN"] or ""
+    token_hash = hashlib.sha256(token.encode("utf-8")).hexdigest()[:16]
+    return f"{token_hash}:{board_name}"
+
+
+def _read_board_id_cache():
+    """Read the on-disk board ID cache, treating a missing or corrupt file as empty."""
+    try:
+        with open(BOARD_ID_CACHE_PATH, "r", encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def load_cached_board_id(_config, _settings, board_name):
+    """Return the board ID saved by an earlier run, provided that board is still open and keeps its name."""
+    board_id = _read_board_id_cache().get(_board_id_cache_key(_config, board_name))
+    if not board_id:
+        return None
+
+    # A single small GET confirms the board still exists, is open and was not renamed
+    board = trello_request(
+        _config, _settings, "", board_id=board_id, fields="closed,name"
+    )
+    if not board or board.get("closed") or board.get("name") != board_name:
+        return None
+    return board_id
+
+
+def save_board_id(_config, board_name, board_id):
+    """Save a resolved board ID so later runs can skip the me/boards scan."""
+    cache = _read_board_id_cache()
+    cache[_board_id_cache_key(_config, board_name)] = board_id
+    try:
+        os.makedirs(os.path.dirname(BOARD_ID_CACHE_PATH), exist_ok=True)
+        with open(BOARD_ID_CACHE_PATH, "w", encoding="utf-8") as file:
+            json.dump(cache, file)
+    except OSError as error:
+        logger.warning("Could not save board ID cache: %s", error)
+
+
+def delete_list(_config, _settings, board_id, list_id):
+    """Delete a list on the board, given the ID the caller already resolved."""
+    response = trello_request(
         _config,
         _settings,
         f"{list_id}/closed",
@@ -201,17 +413,18 @@ def delete_list(_config, _settings, board_id, list_name):
         entity=TRELLO_ENTITY["LIST"],
         value="true",
     )
+    invalidate_lists(board_id)
+    return response
 
 
 def check_list_exists(_config, _settings, board_id, list_name):
     """Check if a list exists on the board."""
-    lists = trello_request(_config, _settings, f"{board_id}/lists")
-    return any(lst["name"] == list_name for lst in lists)
+    return list_name in fetch_all_list_ids(_config, _settings, board_id)
 
 
-def create_list(_config, _settings, board_id, list_name):
+def create_list(_config, _settings, board_id, list_name, pos=None):
     """Create a new list on a board."""
-    return trello_request(
+    response = trello_request(
         _config,
         _settings,
         "",
@@ -219,7 +432,10 @@ def create_list(_config, _settings, board_id, list_name):
         entity=TRELLO_ENTITY["LIST"],
         idBoard=board_id,
         name=list_name,
+        pos=pos,
     )
+    invalidate_lists(board_id)
+    return response
 
 
 def upload_custom_board_background(_config, _settings, member_id, image_filepath):
@@ -255,7 +471,7 @@ def get_member_id(_config, _settings):
 
 def get_labels_on_board(_config, _settings, board_id):
     """Fetch all labels on the board."""
-    return trello_request(_config, _settings, f"{board_id}/labels")
+    return get_labels(_config, _settings, board_id)
 
 
 def delete_label(_config, _settings, label_id):
@@ -268,5 +484,8 @@ def delete_label(_config, _settings, label_id):
 def delete_all_labels(_config, _settings, board_id):
     """Delete all labels on the board."""
     labels = get_labels_on_board(_config, _settings, board_id)
-    for label in labels:
-        delete_label(_config, _settings, label["id"])
+    # Labels are deleted independently, so issue the requests concurrently
+    run_concurrently(
+        lambda label: delete_label(_config, _settings, label["id"]), labels
+    )
+    invalidate_labels(board_id)
@@ -8,24 +8,28 @@ and more.
 
 Functions:
     - card_exists(_config, _settings, board_id, card_name): Checks if a card exists on a specified board.
-    - filter_cards_by_label(cards, _settings): Filters out cards with specific labels defined in _settings.
+    - filter_cards_by_label(cards, _settings): Filters out cards carrying any of the EXCLUDED_LABELS.
     - apply_changes_to_cards(_config, _settings, list_ids, cards_to_add): Applies changes to Trello cards, 
-      especially for managing the "Do this week" list.
-    - get_top_card_from_backlog(_config, _settings, list_ids): Retrieves the top card from the 'Backlog' list.
+      especially for managing the "Do this week" list. Both lists involved are fetched in one batched request.
     - move_card_to_list(_config, _settings, card_id, target_list_id): Moves a card to a specified list.
-    - process_retrospective_cards(_config, _settings, board_id, current_date): Processes the retrospective 
-      cards based on their labels and due dates.
-    - process_completed_cards(_config, _settings, board_id, current_date): Moves completed cards that are due 
-      this week to the 'Do this week' list.
-    - attach_image_to_card(_config, _settings, card_id, topic): Attaches an image to a specified card.
+    - update_retrospective_card(_config, _settings, card, list_ids, current_date): Reschedules a single
+      retrospective card based on its labels.
+    - process_retrospective_cards(_config, _settings, board_id, current_date, list_ids=None, retrospective_cards=None): Processes the retrospective 
+      cards based on their labels and due dates, updating the cards concurrently.
+    - process_completed_cards(_config, _settings, board_id, current_date, list_ids=None, completed_cards=None): Moves completed cards that are due 
+      this week to the 'Do this week' list, concurrently.
+    - card_image_url_base(_config): Returns the URL prefix under which the topic card images are hosted.
+    - attach_image_to_card(_config, _settings, card_id, topic, image_url_base=None): Attaches an image to an existing card
+      (new problem cards get their image through the create call).
     - create_topic_label(_config, _settings, board_id, category): Creates a label for a given topic.
-    - retest_cards(_config, _settings, board_name, current_date): Processes retest cards for a specified board.
+    - retest_cards(_config, _settings, board_name, current_date): Processes retest cards for a specified board,
+      reading the Retrospective and Completed lists in one batched request.
     - manage_this_week_list(__config, __settings, board_id): Ensures the 'To Do this Week' list has the
       required number of cards.
-    - get_max_cards_for_week(_settings): Calculates the maximum number of cards required for the week.
-    - fetch_cards_from_list(_config, _settings, list_id): Fetches all cards from a given list.
-    - process_single_problem_card(_config, _settings, board_id, list_ids, label_ids, topic_label_id, category, problem, due_date, current_date): Creates a Trello card for a single LeetCode problem.
-    - process_all_problem_cards(_config, _settings, board_id, topics, current_date): Processes all problem cards for a given board.
+    - process_single_problem_card(_config, _settings, list_ids, label_ids, existing_card_names, topic_label_id, category, problem, due_date, current_date, comment_md_content, image_url_base, position=None, week_bounds=None): Creates a Trello card for a single LeetCode problem
+      unless a card with the same name is already on the board.
+    - process_all_problem_cards(_config, _settings, board_id, topics, current_date): Processes all problem cards for a given board,
+      creating the cards concurrently.
     - add_comment_to_card(_config, _settings, card_id, comment_content): Adds a comment to a given card.
 
 Dependencies:
@@ -39,26 +43,41 @@ Author: Alex McGonigle @grannyprogramming
 
 
 import logging
-from .trello_api import trello_request
-from .board_operations import fetch_all_list_ids, get_board_id, fetch_all_label_ids
+from .trello_api import (
+    trello_request,
+    trello_batch,
+    run_concurrently,
+)
+from .board_operations import (
+    fetch_all_list_ids,
+    get_board_id,
+    fetch_board_metadata,
+    invalidate_labels,
+)
 from .utilities import (
     determine_new_due_date_and_list,
     parse_card_due_date,
-    is_due_this_week,
+    get_week_bounds,
     generate_leetcode_link,
     generate_all_due_dates,
     get_list_name_and_due_date,
     load_comment_from_md_file,
+    get_max_cards_for_week,
 )
 
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
-)
+# Handlers and format are configured by the entry point (main.py).
+logger = logging.getLogger(__name__)
+
+# Retrospective labels; cards carrying any of them don't count towards the weekly quota.
+EXCLUDED_LABELS = frozenset({"Somewhat know", "Do not know", "Know"})
+
+# Gap between explicit card positions, matching the spacing Trello uses itself.
+CARD_POSITION_STEP = 65536
 
 
 def card_exists(_config, _settings, board_id, card_name):
     """Check if a card exists on the board."""
-    cards = trello_request(_config, _settings, f"{board_id}/cards")
+    cards = trello_request(_config, _settings, f"{board_id}/cards", fields="name")
     return any(card["name"] == card_name for card in cards)
 
 
@@ -67,18 +86,11 @@ def filter_cards_by_label(cards, _settings):
     if not cards:
         return []
 
-    # Extracting the label names from the _settings without considering the colors
-    exclude_labels = set(
-        label_name
-        for label_name, _ in _settings["DEFAULT_LABELS_COLORS"].items()
-        if label_name in ["Somewhat know", "Do not know", "Know"]
-    )
-
     # Filter out cards that have any of the excluded labels
     return [
         card
         for card in cards
-        if not exclude_labels & {label["name"] for label in card["labels"]}
+        if all(label["name"] not in EXCLUDED_LABELS for label in card["labels"])
     ]
 
 
@@ -86,43 +98,49 @@ def apply_changes_to_cards(_config, _settings, list_ids, cards_to_add):
     """Apply the necessary changes to the Trello cards (like pulling cards from backlog)."""
     to_do_this_week_id = list_ids.get("Do this week")
     if not to_do_this_week_id:
-        logging.error("To Do this Week ID not found when trying to apply changes.")
+        logger.error("To Do this Week ID not found when trying to apply changes.")
+        return
+    backlog_id = list_ids.get("Backlog")
+    if not backlog_id:
+        logger.error("Backlog ID not found when trying to apply changes.")
         return
 
-    # Fetch the current cards in the "Do this week" list.
-    current_cards = fetch_cards_from_list(_config, _settings, to_do_this_week_id)
-    if not current_cards:
-        current_cards = []
+    # Fetch the current cards in the "Do this week" and "Backlog" lists in one request.
+    current_cards, backlog_cards = trello_batch(
+        _config,
+        _settings,
+        [
+            f"/lists/{to_do_this_week_id}/cards?fields=labels",
+            f"/lists/{backlog_id}/cards?fields=labels",
+        ],
+    )
+    if current_cards is None or backlog_cards is None:
+        logger.error("Failed to fetch the 'Do this week' and 'Backlog' cards.")
+        return
 
     # Filter out the cards that have the labels "Somewhat know:blue", "Do not know:red", and "Know:green".
     filtered_cards = filter_cards_by_label(current_cards, _settings)
+    logger.info(
+        "Number of filtered cards in 'To Do this Week' list: %s", len(filtered_cards)
+    )
 
     # Calculate how many more cards are needed in the "Do this week" list to meet the weekly quota.
     cards_needed = get_max_cards_for_week(_settings) - len(filtered_cards)
+    logger.info("Need to pull %s cards to meet the weekly quota.", cards_needed)
     cards_to_pull = min(cards_needed, cards_to_add)
+    if cards_to_pull <= 0:
+        return
 
-    for _ in range(cards_to_pull):
-        top_card = get_top_card_from_backlog(_config, _settings, list_ids)
-        if top_card:
-            move_card_to_list(_config, _settings, top_card["id"], to_do_this_week_id)
-        else:
-            logging.warning("No more cards to pull from the 'Backlog'.")
-            break
-
-
-def get_top_card_from_backlog(_config, _settings, list_ids):
-    """
-    Get the top card from the 'Backlog' list.
-    """
-    backlog_id = list_ids.get("Backlog")
-    if not backlog_id:
-        logging.error("Backlog ID not found when trying to get the top card.")
-        return None
-    backlog_cards = fetch_cards_from_list(_config, _settings, backlog_id)
-    if not backlog_cards:
-        logging.warning("No cards found in the 'Backlog' list.")
-        return None
-    return backlog_cards[0]
+    # Move the top backlog cards concurrently.
+    top_cards = backlog_cards[:cards_to_pull]
+    if len(top_cards) < cards_to_pull:
+        logger.warning("No more cards to pull from the 'Backlog'.")
+    run_concurrently(
+        lambda card: move_card_to_list(
+            _config, _settings, card["id"], to_do_this_week_id
+        ),
+        top_cards,
+    )
 
 
 def move_card_to_list(_config, _settings, card_id, target_list_id):
@@ -137,70 +155,99 @@ def move_card_to_list(_config, _settings, card_id, target_list_id):
         entity="cards",  # Explicitly mention the entity here.
         idList=target_list_id,
     )
-    logging.info("Moved card with ID %s to list with ID %s.", card_id, target_list_id)
+    logger.debug("Moved card with ID %s to list with ID %s.", card_id, target_list_id)
 
 
-def process_retrospective_cards(_config, _settings, board_id, current_date):
-    """Process the retrospective cards."""
-    list_ids = fetch_all_list_ids(_config, _settings, board_id)
-    retrospective_list_name = _settings["REQUIRED_LISTS"][1]  # "Retrospective"
-    retrospective_cards = trello_request(
+def update_retrospective_card(_config, _settings, card, list_ids, current_date):
+    """Move a retrospective card and update its due date based on its labels."""
+    label_names = frozenset(label["name"] for label in card["labels"])
+    new_due_date, list_name = determine_new_due_date_and_list(label_names, current_date)
+    if not list_name:
+        return None
+
+    # Update the card's list and due date
+    return trello_request(
         _config,
         _settings,
-        "cards",
-        entity="lists",
-        list_id=list_ids[retrospective_list_name],
+        card["id"],
+        "PUT",
+        entity="cards",
+        idList=list_ids[list_name],
+        due=new_due_date.isoformat(),
     )
 
+
+def process_retrospective_cards(
+    _config, _settings, board_id, current_date, list_ids=None, retrospective_cards=None
+):
+    """Process the retrospective cards."""
+    if list_ids is None:
+        list_ids = fetch_all_list_ids(_config, _settings, board_id)
+    if retrospective_cards is None:
+        retrospective_list_name = _settings["REQUIRED_LISTS"][1]  # "Retrospective"
+        retrospective_cards = trello_request(
+            _config,
+            _settings,
+            "cards",
+            entity="lists",
+            list_id=list_ids[retrospective_list_name],
+            fields="id,labels",
+        )
+
     if retrospective_cards:
-        for card in retrospective_cards:
-            label_names = [label["name"] for label in card["labels"]]
-            new_due_date, list_name = determine_new_due_date_and_list(
-                label_names, current_date
-            )
-            if not list_name:
-                continue
-
-            # Update the card's list and due date
-            trello_request(
-                _config,
-                _settings,
-                card["id"],
-                "PUT",
-                entity="cards",
-                idList=list_ids[list_name],
-                due=new_due_date.isoformat(),
-            )
+        run_concurrently(
+            lambda card: update_retrospective_card(
+                _config, _settings, card, list_ids, current_date
+            ),
+            retrospective_cards,
+        )
 
 
-def process_completed_cards(_config, _settings, board_id, current_date):
+def process_completed_cards(
+    _config, _settings, board_id, current_date, list_ids=None, completed_cards=None
+):
     """Move completed cards that are due this week to the 'Do this week' list."""
-    list_ids = fetch_all_list_ids(_config, _settings, board_id)
-    completed_list_name = _settings["REQUIRED_LISTS"][
-        0
-    ]  # Assuming "Completed" is the first item in REQUIRED_LISTS
-    completed_cards = trello_request(
-        _config,
-        _settings,
-        "cards",
-        entity="lists",
-        list_id=list_ids[completed_list_name],
+    if list_ids is None:
+        list_ids = fetch_all_list_ids(_config, _settings, board_id)
+    if completed_cards is None:
+        completed_list_name = _settings["REQUIRED_LISTS"][
+            0
+        ]  # Assuming "Completed" is the first item in REQUIRED_LISTS
+        completed_cards = trello_request(
+            _config,
+            _settings,
+            "cards",
+            entity="lists",
+            list_id=list_ids[completed_list_name],
+            fields="id,due",
+        )
+
+    if not completed_cards:
+        return
+
+    # The week window is the same for every card, so compute it once.
+    start_of_week, end_of_week = get_week_bounds(current_date)
+    due_cards = [
+        card
+        for card in completed_cards
+        if start_of_week <= parse_card_due_date(card["due"]) <= end_of_week
+    ]
+    run_concurrently(
+        lambda card: move_card_to_list(
+            _config, _settings, card["id"], list_ids["Do this week"]
+        ),
+        due_cards,
     )
 
-    for card in completed_cards:
-        if is_due_this_week(parse_card_due_date(card["due"]), current_date):
-            trello_request(
-                _config,
-                _settings,
-                f"/cards/{card['id']}",
-                "PUT",
-                idList=list_ids["Do this week"],
-            )
 
+def card_image_url_base(_config):
+    """Return the URL prefix of the topic card images."""
+    return f"{_config['RAW_URL_BASE']}imgs/cards/"
 
-def attach_image_to_card(_config, _settings, card_id, topic):
+
+def attach_image_to_card(_config, _settings, card_id, topic, image_url_base=None):
     """Attach an image to a given card."""
-    image_url = f"{_config['RAW_URL_BASE']}imgs/cards/{topic}.png"
+    image_url = f"{image_url_base or card_image_url_base(_config)}{topic}.png"
     response = trello_request(
         _config,
         _settings,
@@ -210,12 +257,12 @@ def attach_image_to_card(_config, _settings, card_id, topic):
         url=image_url,
     )
     if not response:
-        logging.error("Failed to attach image to card %s", card_id)
+        logger.error("Failed to attach image to card %s", card_id)
 
 
 def create_topic_label(_config, _settings, board_id, category):
     """Create a label for a given topic."""
-    return trello_request(
+    response = trello_request(
         _config,
         _settings,
         "/labels",
@@ -225,14 +272,47 @@ def create_topic_label(_config, _settings, board_id, category):
         name=category,
         color="black",
     )
+    invalidate_labels(board_id)
+    return response
 
 
 def retest_cards(_config, _settings, board_name, current_date):
     """Process retest cards for a given board."""
     board_id = get_board_id(_config, _settings, board_name)
-    process_retrospective_cards(_config, _settings, board_id, current_date)
-    process_completed_cards(_config, _settings, board_id, current_date)
-    logging.info("Retest cards processed!")
+    # Both passes work on the same lists, so resolve their IDs once.
+    list_ids = fetch_all_list_ids(_config, _settings, board_id)
+    completed_list_name, retrospective_list_name = _settings["REQUIRED_LISTS"][:2]
+
+    # Read both lists in one request; card IDs are always included. Reading the
+    # Completed list before the first pass moves anything is safe because the
+    # only rule that sends a card there ("Know") dates it four weeks ahead, so it
+    # would never be due this week anyway. A route that failed comes back as
+    # None, and that pass then fetches its list itself.
+    retrospective_cards, completed_cards = trello_batch(
+        _config,
+        _settings,
+        [
+            f"/lists/{list_ids[retrospective_list_name]}/cards?fields=labels",
+            f"/lists/{list_ids[completed_list_name]}/cards?fields=due",
+        ],
+    )
+    process_retrospective_cards(
+        _config,
+        _settings,
+        board_id,
+        current_date,
+        list_ids=list_ids,
+        retrospective_cards=retrospective_cards,
+    )
+    process_completed_cards(
+        _config,
+        _settings,
+        board_id,
+        current_date,
+        list_ids=list_ids,
+        completed_cards=completed_cards,
+    )
+    logger.info("Retest cards processed!")
 
 
 def manage_this_week_list(__config, __settings, board_id):
@@ -241,41 +321,12 @@ def manage_this_week_list(__config, __settings, board_id):
     Cards with specific labels are excluded from this count.
     """
     max_cards = get_max_cards_for_week(__settings)
+    logger.info("Max cards for the week: %s", max_cards)
 
-    # Fetch list IDs and get the ID for "To Do this Week"
+    # apply_changes_to_cards reads the list alongside the backlog in one request
+    # and counts the filtered cards itself, so no cards are fetched here.
     list_ids = fetch_all_list_ids(__config, __settings, board_id)
-    to_do_this_week_name = __settings["REQUIRED_LISTS"][2]
-    to_do_this_week_id = list_ids.get(to_do_this_week_name)
-
-    # Fetch and filter cards
-    cards = fetch_cards_from_list(__config, __settings, to_do_this_week_id)
-    filtered_cards = filter_cards_by_label(cards, __settings)
-
-    logging.info("Max cards for the week: %s", max_cards)
-    logging.info(
-        "Number of filtered cards in 'To Do this Week' list: %s", len(filtered_cards)
-    )
-
-    # Calculate the number of cards to pull
-    cards_to_pull_count = max_cards - len(filtered_cards)
-
-    logging.info("Need to pull %s cards to meet the weekly quota.", cards_to_pull_count)
-
-    apply_changes_to_cards(__config, __settings, list_ids, cards_to_pull_count)
-
-
-def get_max_cards_for_week(_settings):
-    """Calculate maximum cards for the week."""
-    return _settings["PROBLEMS_PER_DAY"] * _settings["WORKDAYS"]
-
-
-def fetch_cards_from_list(_config, _settings, list_id):
-    """Fetch all cards from a given list."""
-    logging.debug("Fetching cards for list_id: %s", list_id)
-    if not list_id:
-        logging.error("list_id is not provided when trying to fetch cards from a list.")
-        return None
-    return trello_request(_config, _settings, "cards", entity="lists", list_id=list_id)
+    apply_changes_to_cards(__config, __settings, list_ids, max_cards)
 
 
 def add_comment_to_card(_config, _settings, card_id, comment_content):
@@ -289,35 +340,37 @@ def add_comment_to_card(_config, _settings, card_id, comment_content):
         text=comment_content,
     )
     if not response:
-        logging.error("Failed to add comment to card %s", card_id)
+        logger.error("Failed to add comment to card %s", card_id)
 
 
 def process_single_problem_card(
     _config,
     _settings,
-    board_id,
     list_ids,
     label_ids,
+    existing_card_names,
     topic_label_id,
     category,
     problem,
     due_date,
     current_date,
+    comment_md_content,
+    image_url_base,
+    position=None,
+    week_bounds=None,
 ):
     """
     Create a Trello card for a single LeetCode problem.
     """
     card_name = f"{category}: {problem['title']}"
-    if not card_exists(_config, _settings, board_id, card_name):
+    if card_name not in existing_card_names:
         difficulty_label_id = label_ids.get(problem["difficulty"])
         if not difficulty_label_id:
-            logging.error(
-                "Difficulty label not found for problem: %s", problem["title"]
-            )
+            logger.error("Difficulty label not found for problem: %s", problem["title"])
             return
         link = generate_leetcode_link(problem["title"])
         list_name, due_date_for_card = get_list_name_and_due_date(
-            due_date, current_date
+            due_date, current_date, week_bounds
         )
         card_response = trello_request(
             _config,
@@ -330,43 +383,89 @@ def process_single_problem_card(
             desc=link,
             idLabels=[difficulty_label_id, topic_label_id],
             due=due_date_for_card.isoformat(),
+            pos=position,
+            # Attach the topic image as part of the create call
+            urlSource=f"{image_url_base}{category}.png",
         )
         if not card_response:
-            logging.error("Failed to create card: %s", card_name)
+            logger.error("Failed to create card: %s", card_name)
             return
-        attach_image_to_card(_config, _settings, card_response["id"], category)
-        comment_md_content = load_comment_from_md_file(_settings["COMMENT_MD_PATH"])
+        existing_card_names.add(card_name)
         add_comment_to_card(_config, _settings, card_response["id"], comment_md_content)
 
 
 def process_all_problem_cards(_config, _settings, board_id, topics, current_date):
     """Process all problem cards for a given board."""
-    list_ids = fetch_all_list_ids(_config, _settings, board_id)
-    label_ids = fetch_all_label_ids(_config, _settings, board_id)
-    all_due_dates = generate_all_due_dates(
+    list_ids, label_ids = fetch_board_metadata(_config, _settings, board_id)
+
+    # Fetch the board's card names and positions once instead of once per problem.
+    existing_cards = trello_request(
+        _config, _settings, f"{board_id}/cards", fields="name,pos"
+    )
+    if existing_cards is None:
+        logger.error("Failed to fetch cards for board with ID: %s", board_id)
+        return
+    existing_card_names = {card["name"] for card in existing_cards}
+    # New cards go after every card already on the board.
+    base_position = max((card["pos"] for card in existing_cards), default=0)
+
+    due_dates = generate_all_due_dates(
         topics, current_date, _settings["PROBLEMS_PER_DAY"]
     )
-    due_date_index = 0
+    comment_md_content = load_comment_from_md_file(_settings["COMMENT_MD_PATH"])
+    image_url_base = card_image_url_base(_config)
+    week_bounds = get_week_bounds(current_date)
+
+    # Reuse topic labels from earlier runs and create the missing ones up front,
+    # concurrently, so the card loop below needs no label requests.
+    topic_label_ids = {name: label_ids[name] for name in topics if name in label_ids}
+    missing_topics = [category for category in topics if category not in label_ids]
+    created_labels = run_concurrently(
+        lambda category: create_topic_label(_config, _settings, board_id, category),
+        missing_topics,
+    )
+    for category, topic_label_response in zip(missing_topics, created_labels):
+        if topic_label_response is None:
+            logger.error("Failed to create label for category: %s", category)
+            continue
+        topic_label_ids[category] = topic_label_response["id"]
+
+    card_jobs = []
 
     for category, problems in topics.items():
-        topic_label_response = create_topic_label(
-            _config, _settings, board_id, category
-        )
-        if topic_label_response is None:
-            logging.error("Failed to create label for category: %s", category)
+        if category not in topic_label_ids:
             continue
-        topic_label_id = topic_label_response["id"]
+        topic_label_id = topic_label_ids[category]
         for problem in problems:
-            process_single_problem_card(
-                _config,
-                _settings,
-                board_id,
-                list_ids,
-                label_ids,
-                topic_label_id,
-                category,
-                problem,
-                all_due_dates[due_date_index],
-                current_date,
+            # Cards are created concurrently, so pin each card's position to its
+            # place in the schedule to keep the lists ordered by due date.
+            card_jobs.append(
+                (
+                    topic_label_id,
+                    category,
+                    problem,
+                    next(due_dates),
+                    base_position + (len(card_jobs) + 1) * CARD_POSITION_STEP,
+                )
             )
-            due_date_index += 1
+
+    def create_card(job):
+        topic_label_id, category, problem, due_date, position = job
+        process_single_problem_card(
+            _config,
+            _settings,
+            list_ids,
+            label_ids,
+            existing_card_names,
+            topic_label_id,
+            category,
+            problem,
+            due_date,
+            current_date,
+            comment_md_content,
+            image_url_base,
+            position,
+            week_bounds,
+        )
+
+    run_concurrently(create_card, card_jobs)
@@ -9,9 +9,17 @@ Functions:
     - load_ini_settings: Loads settings from an INI file and returns them as a dictionary.
     - load_config: Loads API and other related configurations from environment variables.
 
+Both loaders are memoized, so the INI file and environment are read once per process
+no matter how many modules ask for them. The shared result is returned as a read-only
+mapping, with list values as tuples and nested mappings read-only too, so one caller
+cannot change the settings seen by every other.
+
 Dependencies:
     - os: Used to access environment variables.
+    - re: Used to split comma-separated INI values.
     - configparser: Used to parse INI configuration files.
+    - functools: Used to memoize the loaded settings.
+    - types: Used to expose the memoized settings as read-only mappings.
 
 Usage:
     Ensure that the required settings are available in ".config/settings.ini" for `load_ini_settings` 
@@ -27,9 +35,16 @@ Author: Alex McGonigle @grannyprogramming
 
 
 import os
+import re
 import configparser
+from functools import lru_cache
+from types import MappingProxyType
+
+# Separator for comma-separated INI values, tolerant of surrounding whitespace.
+_LIST_SEPARATOR = re.compile(r"\s*,\s*")
 
 
+@lru_cache(maxsize=1)
 def load_ini_settings():
     """
     Load application-specific settings from an INI file.
@@ -37,29 +52,39 @@ def load_ini_settings():
     config = configparser.ConfigParser()
     config.read("config/settings.ini")
 
-    return {
-        "BASE_URL": config["TRELLO"]["BASE_URL"],
-        "BOARD_NAME": config["TRELLO"]["BOARD_NAME"],
-        "DEFAULT_LISTS": config["LISTS"]["DEFAULTS"].split(", "),
-        "REQUIRED_LISTS": config["LISTS"]["REQUIRED"].split(", "),
-        "START_DAY": int(config["WEEK"]["START_DAY"]),
-        "END_DAY": int(config["WEEK"]["END_DAY"]),
-        "WORKDAYS": int(config["WEEK"]["WORKDAYS"]),
-        "DEFAULT_LABELS_COLORS": dict(
-            item.split(":") for item in config["LABELS"]["DEFAULT_COLORS"].split(", ")
-        ),
-        "PROBLEMS_PER_DAY": int(config["PROBLEMS"]["PROBLEMS_PER_DAY"]),
-        "COMMENT_MD_PATH": config["FILES"]["COMMENT_MD_PATH"],
-    }
+    return MappingProxyType(
+        {
+            "BASE_URL": config["TRELLO"]["BASE_URL"],
+            "BOARD_NAME": config["TRELLO"]["BOARD_NAME"],
+            "DEFAULT_LISTS": tuple(_LIST_SEPARATOR.split(config["LISTS"]["DEFAULTS"])),
+            "REQUIRED_LISTS": tuple(_LIST_SEPARATOR.split(config["LISTS"]["REQUIRED"])),
+            "START_DAY": int(config["WEEK"]["START_DAY"]),
+            "END_DAY": int(config["WEEK"]["END_DAY"]),
+            "WORKDAYS": int(config["WEEK"]["WORKDAYS"]),
+            "DEFAULT_LABELS_COLORS": MappingProxyType(
+                dict(
+                    item.split(":")
+                    for item in _LIST_SEPARATOR.split(
+                        config["LABELS"]["DEFAULT_COLORS"]
+                    )
+                )
+            ),
+            "PROBLEMS_PER_DAY": int(config["PROBLEMS"]["PROBLEMS_PER_DAY"]),
+            "COMMENT_MD_PATH": config["FILES"]["COMMENT_MD_PATH"],
+        }
+    )
 
 
+@lru_cache(maxsize=1)
 def load_config():
     """
     Load essential configurations from environment variables.
     """
-    return {
-        "API_KEY": os.environ.get("API_KEY"),
-        "OAUTH_TOKEN": os.environ.get("OAUTH_TOKEN"),
-        "RAW_URL_BASE": os.environ.get("RAW_URL_BASE"),
-        "TOPICS_JSON_PATH": os.environ.get("TOPICS_JSON_PATH"),
-    }
+    return MappingProxyType(
+        {
+            "API_KEY": os.environ.get("API_KEY"),
+            "OAUTH_TOKEN": os.environ.get("OAUTH_TOKEN"),
+            "RAW_URL_BASE": os.environ.get("RAW_URL_BASE"),
+            "TOPICS_JSON_PATH": os.environ.get("TOPICS_JSON_PATH"),
+        }
+    )
@@ -6,37 +6,154 @@ a variety of functions for sending requests, constructing URLs, downloading imag
 
 Functions:
     - make_request(url, method, params=None, data=None, timeout=None, files=None): Sends a request to a specified URL and handles exceptions and logging.
+      Each call first waits on the per-token rate limiter. Repeat GETs are sent as conditional requests
+      and served from _ETAG_CACHE on 304 Not Modified.
     - trello_request(_config, _settings, resource, method="GET", entity="boards", timeout=None, files=None, **kwargs): Sends a request to the Trello API using specified _configurations and _settings.
     - construct_url(base_url, entity, resource, **kwargs): Constructs a URL for the Trello API based on provided parameters.
-    - download_image(url, filepath="tmp_image.png"): Downloads an image from a given URL and saves it to a specific path.
-    - fetch_cards_from_list(_config, _settings, list_id): Fetches all cards from a given Trello list.
+    - download_image(url, filepath=None): Downloads an image from a given URL and saves it to a specific path
+      (a temporary file by default, which the caller removes when done).
+    - fetch_cards_from_list(_config, _settings, list_id, **kwargs): Fetches all cards from a given Trello list,
+      passing any extra query parameters (such as fields) through.
+    - trello_batch(_config, _settings, urls): Fetches up to ten GET routes in a single request.
+    - run_concurrently(func, items, max_workers=MAX_WORKERS): Applies a function to every item on a thread pool.
 
 Dependencies:
     - logging: Used for logging information and error messages.
-    - requests: Used for making HTTP requests.
+    - requests: Used for making HTTP requests over a shared, pooled session.
+    - concurrent.futures / threading / time: Used for issuing independent requests in parallel
+      while keeping the request rate under Trello's per-token limit.
+    - os / tempfile: Used to stream downloads to disk.
 
 Author: Alex McGonigle @grannyprogramming
 """
 
 import logging
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+# Handlers and format are configured by the entry point (main.py).
+logger = logging.getLogger(__name__)
+
+# Upper bound on threads issuing requests at once; the request rate itself is
+# capped by the rate limiter below.
+MAX_WORKERS = 8
+
+# Trello allows 100 requests per 10 seconds per token. A token bucket refilling at
+# 9 requests/s with bursts of 10 admits at most 10 + 9 * 10 = 100 in any 10 s window.
+TRELLO_REQUESTS_PER_SECOND = 9
+TRELLO_REQUEST_BURST = 10
+
+
+class _RateLimiter:
+    """Token bucket shared by every thread sending requests with the same token."""
+
+    def __init__(self, rate, burst):
+        self._rate = rate
+        self._burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Reserve one request, sleeping until the bucket allows it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self._burst, self._tokens + (now - self._updated) * self._rate
+            )
+            self._updated = now
+            # Reserving before sleeping queues concurrent callers in order
+            self._tokens -= 1
+            wait = -self._tokens / self._rate if self._tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
+
+
+# One limiter per OAuth token, since Trello's limit is counted per token.
+_RATE_LIMITERS = {}
+_RATE_LIMITERS_LOCK = threading.Lock()
+
+
+def _rate_limiter(token):
+    """Return the rate limiter for a token, creating it on first use."""
+    with _RATE_LIMITERS_LOCK:
+        if token not in _RATE_LIMITERS:
+            _RATE_LIMITERS[token] = _RateLimiter(
+                TRELLO_REQUESTS_PER_SECOND, TRELLO_REQUEST_BURST
+            )
+        return _RATE_LIMITERS[token]
+
+
+class _TrelloRetry(Retry):
+    """Retry policy that also retries rate-limited non-idempotent requests."""
+
+    def is_retry(self, method, status_code, has_retry_after=False):
+        # Trello rejects a 429 before processing it, so resending any method is safe
+        if status_code == 429 and self.total:
+            return True
+        return super().is_retry(method, status_code, has_retry_after)
+
+
+# A single session keeps connections to Trello alive across calls and retries
+# rate-limited (429) and transient server errors with backoff. 429s are retried
+# for every method; server errors only for idempotent ones (urllib3's default),
+# so a retried POST can't duplicate a card.
+# requests already asks for gzip/deflate responses by default.
+_SESSION = requests.Session()
+_SESSION.headers.update(
+    {"Accept": "application/json", "User-Agent": "leetcode-trello-scheduler/1.0"}
+)
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=2,  # Trello and the raw image host
+        pool_maxsize=MAX_WORKERS + 2,
+        max_retries=_TrelloRetry(
+            total=5, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504]
+        ),
+    ),
 )
 
+# ETag and payload of earlier GETs, keyed by URL and query, for conditional requests.
+_ETAG_CACHE = {}
+
 
 def make_request(url, method, params=None, data=None, timeout=None, files=None):
     """Send a request and handle exceptions and logging."""
+    cache_key = cached = headers = None
+    if method == "GET":
+        cache_key = (url, tuple(sorted((params or {}).items())))
+        cached = _ETAG_CACHE.get(cache_key)
+        if cached:
+            headers = {"If-None-Match": cached[0]}
+    _rate_limiter((params or {}).get("token")).acquire()
     try:
-        with requests.request(
-            method, url, params=params, data=data, timeout=timeout, files=files
+        with _SESSION.request(
+            method,
+            url,
+            params=params,
+            data=data,
+            headers=headers,
+            timeout=timeout,
+            files=files,
         ) as response:
+            if cached and response.status_code == 304:
+                return cached[1]
             response.raise_for_status()
-            return response.json()
+            payload = response.json()
+            etag = response.headers.get("ETag")
+            if cache_key and etag:
+                _ETAG_CACHE[cache_key] = (etag, payload)
+            return payload
     except (requests.RequestException, requests.exceptions.JSONDecodeError) as error:
-        logging.error("Request to %s failed. Error: %s", url, error)
+        logger.error("Request to %s failed. Error: %s", url, error)
         return None
 
 
@@ -60,7 +177,7 @@ def trello_request(
     query = {"key": _config["API_KEY"], "token": _config["OAUTH_TOKEN"]}
     query.update(kwargs)  # Always add the kwargs to the query parameters
 
-    logging.info("Making a request to endpoint: %s with method: %s", method, url)
+    logger.debug("Making a request to endpoint: %s with method: %s", method, url)
     return make_request(url, method, params=query, timeout=timeout, files=files)
 
 
@@ -69,59 +186,92 @@ def construct_url(base_url, entity, resource, **kwargs):
     Construct the URL by joining base_url, entity, board_id (if provided), list_id (if provided), and resource.
     Ensure that there are no double slashes.
     """
-    # Prepare a list to hold all components of the URL.
-    url_components = [base_url.rstrip("/")]  # Ensure base_url doesn't end with a slash
-
-    # Add the entity (boards, lists, cards, etc.)
-    url_components.append(entity)
-
-    # If card_id is provided, add it
-    if "card_id" in kwargs and kwargs["card_id"]:
-        url_components.append(kwargs["card_id"])
+    # A card ID identifies the resource on its own; otherwise board and list IDs nest.
+    if kwargs.get("card_id"):
+        ids = (kwargs["card_id"],)
     else:
-        # If board_id is provided, add it
-        if "board_id" in kwargs and kwargs["board_id"]:
-            url_components.append(kwargs["board_id"])
-
-        # If list_id is provided, add it
-        if "list_id" in kwargs and kwargs["list_id"]:
-            url_components.append(kwargs["list_id"])
-
-    # Add the resource without any leading slash
-    url_components.append(resource.lstrip("/"))
-
-    # Debug logs to identify the issue
-    logging.debug("URL Components before cleaning: %s", url_components)
+        ids = (kwargs.get("board_id"), kwargs.get("list_id"))
 
-    # Filter out None or empty components and join them with '/'
+    # Ensure base_url doesn't end with a slash and resource has no leading slash,
+    # then drop missing components and join the rest with '/'
+    url_components = (base_url.rstrip("/"), entity, *ids, resource.lstrip("/"))
     cleaned_url = "/".join(filter(None, url_components))
 
-    logging.debug("Constructed URL: %s", cleaned_url)
+    logger.debug("Constructed URL: %s", cleaned_url)
     return cleaned_url
 
 
-def download_image(url, filepath="tmp_image.png"):
-    """Download an image from a given URL and save it to a specified path."""
+def download_image(url, filepath=None):
+    """Download an image from a given URL and save it to a specified path, or a temporary file."""
     try:
-        response = requests.get(url, timeout=10)  # Added timeout of 10 seconds
-        if response.status_code == 200:
-            with open(filepath, "wb") as file:
-                file.write(response.content)
-            return filepath
-        else:
-            logging.error(
-                "Failed to download image. HTTP status code: %s", response.status_code
-            )
-            return None
-    except requests.Timeout:
-        logging.error("Request to %s timed out.", url)
+        # Added timeout of 10 seconds; stream so the image is never fully buffered
+        with _SESSION.get(url, timeout=10, stream=True) as response:
+            if response.status_code == 200:
+                if filepath is None:
+                    # A fresh private file per download, which the caller removes after use
+                    file = tempfile.NamedTemporaryFile(
+                        suffix=os.path.splitext(url)[1], delete=False
+                    )
+                else:
+                    file = open(filepath, "wb")
+                try:
+                    with file:
+                        # iter_content decodes the body and wraps stream errors in
+                        # requests exceptions, unlike reading response.raw directly
+                        for chunk in response.iter_content(64 * 1024):
+                            file.write(chunk)
+                except requests.RequestException:
+                    # The caller never sees a failed temporary file, so remove it here
+                    if filepath is None:
+                        os.remove(file.name)
+                    raise
+                return file.name
+            else:
+                logger.error(
+                    "Failed to download image. HTTP status code: %s",
+                    response.status_code,
+                )
+                return None
+    except requests.RequestException as error:
+        logger.error("Request to %s failed. Error: %s", url, error)
         return None
 
 
-def fetch_cards_from_list(_config, _settings, list_id):
+def fetch_cards_from_list(_config, _settings, list_id, **kwargs):
     """Fetch all cards from a given list."""
-    logging.debug("Fetching cards for list_id: %s", list_id)
+    logger.debug("Fetching cards for list_id: %s", list_id)
     if not list_id:
-        logging.error("list_id is not provided when trying to fetch cards from a list.")
+        logger.error("list_id is not provided when trying to fetch cards from a list.")
         return None
-    return trello_request(_config, _settings, "cards", entity="lists", list_id=list_id)
+    return trello_request(
+        _config, _settings, "cards", entity="lists", list_id=list_id, **kwargs
+    )
+
+
+def trello_batch(_config, _settings, urls):
+    """
+    Fetch up to ten GET routes (e.g. "/lists/{id}/cards") in one request via Trello's batch endpoint.
+    Returns the response bodies in the same order, with None for any route that failed.
+    """
+    responses = trello_request(
+        _config, _settings, "batch", entity="", urls=",".join(urls)
+    )
+    if responses is None:
+        return [None] * len(urls)
+    results = []
+    for url, response in zip(urls, responses):
+        if "200" not in response:
+            # Failed routes carry their status code instead of a "200" key
+            logger.error(
+                "Batched request to %s failed with status %s",
+                url,
+                response.get("statusCode", next(iter(response), None)),
+            )
+        results.append(response.get("200"))
+    return results
+
+
+def run_concurrently(func, items, max_workers=MAX_WORKERS):
+    """Apply func to every item on a thread pool and return the results in order."""
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(func, items))
@@ -7,80 +7,107 @@ parsing and managing dates, and more.
 
 Functions:
     - generate_leetcode_link(title): Generates a direct link to a LeetCode problem based on its title.
-    - generate_all_due_dates(topics, current_date, problems_per_day): Generates due dates for every problem, taking into account weekdays.
-    - get_list_name_and_due_date(due_date, current_date): Determines the appropriate list name and due date based on the current date.
+    - generate_all_due_dates(topics, current_date, problems_per_day): Lazily yields a due date for every problem, taking into account weekdays.
+    - add_working_days(date, days): Returns the date a given number of working days after a weekday, in constant time.
+    - get_list_name_and_due_date(due_date, current_date, week_bounds=None): Determines the appropriate list name and due date based on the current date,
+      optionally reusing week bounds the caller already computed.
+    - get_week_bounds(current_date): Returns the start (Monday) and end (Friday) of the week containing a date,
+      memoized for the few dates a run classifies against.
     - is_due_this_week(due_date, current_date): Checks if a specified due date falls within the current week.
     - get_next_working_day(date): Returns the next working day after a given date, excluding weekends.
     - get_max_cards_for_week(_settings): Calculates the maximum number of cards required for the week.
     - determine_new_due_date_and_list(label_names, current_date): Determines the new due date and list for a card based on its labels.
-    - parse_card_due_date(card_due): Parses the 'due' date of a card into a datetime object.
-    - load_comment_from_md_file(md_file_path): Loads the content of a markdown file and returns it as a string.
+    - parse_card_due_date(card_due): Parses the 'due' date of a card into a datetime object, memoized per string.
+    - load_comment_from_md_file(md_file_path): Loads the content of a markdown file and returns it as a string,
+      reading each path once per process.
 
 Dependencies:
-    - logging: Used for logging information and error messages.
     - os: Provides a way of using operating system-dependent functionality.
     - datetime: Used for date operations and manipulations.
+    - itertools: Used to produce the due-date schedule lazily.
+    - string / functools: Used to build and memoize LeetCode problem slugs and other pure lookups.
 
 Author: Alex McGonigle @grannyprogramming
 """
 
 
-import logging
+import itertools
 import os
+import string
 from datetime import timedelta, datetime
-
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+from functools import lru_cache
+
+# Days from each weekday (Monday=0) to the next working day: Friday and
+# Saturday jump ahead to Monday, every other day moves on by one.
+_NEXT_WORKING_DAY_OFFSET = (1, 1, 1, 1, 3, 2, 1)
+
+# Retrospective label -> (delay before the next working day, target list), checked
+# in priority order. A None list means "Do this week" if the date falls this week.
+_RETROSPECTIVE_RULES = (
+    ("Do not know", timedelta(0), "Do this week"),
+    ("Somewhat know", timedelta(weeks=1), None),
+    ("Know", timedelta(weeks=4), "Completed"),
 )
 
+# Lowercases and hyphenates a problem title in a single pass.
+_SLUG_TABLE = str.maketrans(string.ascii_uppercase + " ", string.ascii_lowercase + "-")
+
 
+@lru_cache(maxsize=256)
 def generate_leetcode_link(title):
     """Generate a direct LeetCode problem link based on its title."""
-    return f"https://leetcode.com/problems/{title.lower().replace(' ', '-')}/"
+    return f"https://leetcode.com/problems/{title.translate(_SLUG_TABLE)}/"
 
 
 def generate_all_due_dates(topics, current_date, problems_per_day):
-    """Generate due dates for every problem, considering weekdays."""
-    due_dates = []
+    """Yield a due date for every problem, in order, considering weekdays."""
     total_problems = sum(len(problems) for problems in topics.values())
-    day = current_date
 
-    while (
-        len(due_dates) < total_problems
-    ):  # While loop to ensure all problems get a due date
-        if day.weekday() < 5:  # 0-4 denotes Monday to Friday
-            for _ in range(
-                min(problems_per_day, total_problems - len(due_dates))
-            ):  # Ensure we don't overshoot the total problems
-                due_dates.append(day)
-            day += timedelta(days=1)
-        else:
-            day += timedelta(days=1)  # Increment the day even if it's a weekend
+    # Start on the current day, or the following Monday if it falls on a weekend.
+    first_day = current_date
+    if first_day.weekday() >= 5:
+        first_day += timedelta(days=7 - first_day.weekday())
+
+    # Each working day is computed once and shared by all problems due on it.
+    working_days = (add_working_days(first_day, offset) for offset in itertools.count())
+    due_dates = (day for day in working_days for _ in range(problems_per_day))
+    yield from itertools.islice(due_dates, total_problems)
 
-    return due_dates
 
+def add_working_days(date, days):
+    """Return the date `days` working days after `date`, which must be a weekday."""
+    weeks, remainder = divmod(days, 5)
+    if date.weekday() + remainder >= 5:  # The remainder runs over a weekend
+        remainder += 2
+    return date + timedelta(weeks=weeks, days=remainder)
 
-def get_list_name_and_due_date(due_date, current_date):
+
+def get_list_name_and_due_date(due_date, current_date, week_bounds=None):
     """Determine the appropriate list name and due date based on the current date."""
+    start_of_week, end_of_week = week_bounds or get_week_bounds(current_date)
     list_name = (
-        "Do this week" if is_due_this_week(due_date, current_date) else "Backlog"
+        "Do this week" if start_of_week <= due_date <= end_of_week else "Backlog"
     )
     return list_name, due_date
 
 
-def is_due_this_week(due_date, current_date):
-    """Determine if a given due date falls within the current week."""
+@lru_cache(maxsize=4)
+def get_week_bounds(current_date):
+    """Return the start (Monday) and end (Friday) of the week containing the given date."""
     start_of_week = current_date - timedelta(days=current_date.weekday())
     end_of_week = start_of_week + timedelta(days=4)
+    return start_of_week, end_of_week
+
+
+def is_due_this_week(due_date, current_date):
+    """Determine if a given due date falls within the current week."""
+    start_of_week, end_of_week = get_week_bounds(current_date)
     return start_of_week <= due_date <= end_of_week
 
 
 def get_next_working_day(date):
     """Get the next working day after a given date, skipping weekends."""
-    next_day = date + timedelta(days=1)
-    while next_day.weekday() >= 5:  # Skip weekends
-        next_day += timedelta(days=1)
-    return next_day
+    return date + timedelta(days=_NEXT_WORKING_DAY_OFFSET[date.weekday()])
 
 
 def get_max_cards_for_week(_settings):
@@ -90,28 +117,30 @@ def get_max_cards_for_week(_settings):
 
 def determine_new_due_date_and_list(label_names, current_date):
     """Determine the new due date and list based on labels."""
-    if "Do not know" in label_names:
-        new_due_date = get_next_working_day(current_date)
-        return new_due_date, "Do this week"
-    elif "Somewhat know" in label_names:
-        new_due_date = get_next_working_day(current_date + timedelta(weeks=1))
-        list_name = (
-            "Do this week"
-            if is_due_this_week(new_due_date, current_date)
-            else "Backlog"
-        )
-        return new_due_date, list_name
-    elif "Know" in label_names:
-        new_due_date = get_next_working_day(current_date + timedelta(weeks=4))
-        return new_due_date, "Completed"
+    for label, delay, list_name in _RETROSPECTIVE_RULES:
+        if label in label_names:
+            new_due_date = get_next_working_day(current_date + delay)
+            if list_name is None:
+                list_name = (
+                    "Do this week"
+                    if is_due_this_week(new_due_date, current_date)
+                    else "Backlog"
+                )
+            return new_due_date, list_name
     return None, None
 
 
+@lru_cache(maxsize=8192)
 def parse_card_due_date(card_due):
     """Parse the 'due' date of a card into a datetime object."""
-    return datetime.fromisoformat(card_due.replace("Z", ""))
+    # Trello always suffixes UTC timestamps with "Z"; trim it rather than
+    # scanning the whole string with str.replace.
+    if card_due.endswith("Z"):
+        card_due = card_due[:-1]
+    return datetime.fromisoformat(card_due)
 
 
+@lru_cache(maxsize=32)
 def load_comment_from_md_file(md_file_path):
     """
     Load the content of the markdown file and return as a string.